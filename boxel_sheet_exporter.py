@@ -12,13 +12,104 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Optional, Dict, Any, List
+from typing import Iterable, Iterator, Optional, Dict, Any, Tuple
 
 import re
+from itertools import chain
 import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 
+_SAFE_CMDR_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+# Data-row styling (alternating shading + subtle bottom border)
+_TS_FORMAT = "YYYY-MM-DD HH:MM:SS"
+_DATA_FONT = Font(name="Calibri", size=10)
+_DATA_FONT_TS = Font(name="Calibri", size=10, color="555555")
+_EVEN_FILL = PatternFill(start_color="F2F7FB", end_color="F2F7FB", fill_type="solid")
+_THIN_BORDER = Border(
+    bottom=Side(style="thin", color="D9E2EC"),
+)
+
+
+
+def _parse_utc(ts_str: str) -> Optional[datetime]:
+    """
+    Parse a stored created_at_utc string into a naive datetime.
+
+    Rows written by observer_storage all share the shape
+    ``YYYY-MM-DDTHH:MM:SS[.ffffff]+00:00`` (or a trailing ``Z``), so those are
+    sliced directly; anything else goes through datetime.fromisoformat().
+
+    Returns:
+        Naive datetime, or None if the string is not a valid timestamp
+    """
+    if ts_str.endswith("+00:00"):
+        body = ts_str[:-6]
+    elif ts_str.endswith("Z"):
+        body = ts_str[:-1]
+    else:
+        body = None
+
+    if (
+        body is not None
+        and (len(body) == 19 or (len(body) == 26 and body[19] == "."))
+        and body[4] == "-" and body[7] == "-" and body[10] == "T"
+        and body[13] == ":" and body[16] == ":"
+    ):
+        fields = [body[0:4], body[5:7], body[8:10], body[11:13], body[14:16], body[17:19]]
+        if len(body) == 26:
+            fields.append(body[20:26])
+        # isdigit() rejects signs/spaces that int() would quietly accept
+        if all(part.isdigit() for part in fields):
+            try:
+                return datetime(*map(int, fields))
+            except ValueError:
+                return None
+
+    try:
+        if ts_str.endswith("Z"):
+            ts_str = ts_str[:-1] + "+00:00"
+        return datetime.fromisoformat(ts_str).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _add_row_style(
+    wb: openpyxl.Workbook,
+    name: str,
+    font: Font,
+    fill: Optional[PatternFill] = None,
+    number_format: str = "General",
+) -> str:
+    """Register a data-row NamedStyle on wb and return its name."""
+    style = NamedStyle(name=name, font=font, border=_THIN_BORDER, number_format=number_format)
+    if fill is not None:
+        style.fill = fill
+    wb.add_named_style(style)
+    return style.name
+
+
+def _iter_valid(entries: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """Yield (entry, stripped highest system) for entries that have one."""
+    for e in entries:
+        if e:
+            system = (e.get("boxel_highest_system") or "").strip()
+            if system:
+                yield e, system
+
+
+def _row_values(
+    rows: Iterable[Tuple[Dict[str, Any], str]],
+    cmdr_name: str,
+) -> Iterator[Tuple[Any, str, str]]:
+    """Yield (timestamp, commander, highest system) for each boxel entry."""
+    for d, system in rows:
+        # Timestamp (falls back to the raw string if it cannot be parsed)
+        ts_str = d.get("created_at_utc") or ""
+        yield _parse_utc(ts_str) or ts_str, d.get("cmdr_name") or cmdr_name, system
+
 
 def export_boxel_sheet(
     entries: Iterable[Dict[str, Any]],
@@ -39,14 +130,26 @@ def export_boxel_sheet(
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    rows = [e for e in entries if e and (e.get("boxel_highest_system") or "").strip()]
-    if not rows:
+    # Entries are filtered lazily; peek one so an empty export writes nothing
+    valid = _iter_valid(entries)
+    first = next(valid, None)
+    if first is None:
         return None
+    rows = chain((first,), valid)
 
-    # Create workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Boxel Size"
+    title = "DW3 Stellar Properties Boxel Size"
+    subtitle = f"CMDR {cmdr_name}  ·  Exported {datetime.utcnow().strftime('%Y-%m-%d %H:%M')} UTC"
+    headers = ["Timestamp", "Commander Name", "Highest System in Boxel", "Column 3"]
+    col_widths = [24, 28, 42, 14]
+
+    safe_cmdr = _SAFE_CMDR_RE.sub("_", cmdr_name or "UnknownCMDR")
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    filename = f"DW3_Stellar_Properties_Boxels_{safe_cmdr}_{ts}.xlsx"
+    file_path = output_dir / filename
+
+    # Create workbook (write-only: rows are streamed to disk as they are appended)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Boxel Size")
 
     # --- Styles ---
     title_font = Font(name="Calibri", size=14, bold=True, color="1F4E79")
@@ -54,91 +157,81 @@ def export_boxel_sheet(
     header_font = Font(name="Calibri", size=11, bold=True, color="FFFFFF")
     header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
     header_alignment = Alignment(horizontal="center", vertical="center")
-    data_font = Font(name="Calibri", size=10)
-    data_font_ts = Font(name="Calibri", size=10, color="555555")
-    even_fill = PatternFill(start_color="F2F7FB", end_color="F2F7FB", fill_type="solid")
-    thin_border = Border(
-        bottom=Side(style="thin", color="D9E2EC"),
+
+    # Pre-composed row styles: every data cell gets exactly one style assignment
+    # (a name lookup) instead of separate font/fill/border/number_format writes.
+    even_row_style = (
+        _add_row_style(wb, "boxel_ts_even", _DATA_FONT_TS, _EVEN_FILL, _TS_FORMAT),
+        _add_row_style(wb, "boxel_data_even", _DATA_FONT, _EVEN_FILL),
+    )
+    odd_row_style = (
+        _add_row_style(wb, "boxel_ts_odd", _DATA_FONT_TS, number_format=_TS_FORMAT),
+        _add_row_style(wb, "boxel_data_odd", _DATA_FONT),
     )
 
+    # --- Sheet layout (must be set before the first append) ---
+    HEADER_ROW = 4
+    DATA_START = HEADER_ROW + 1
+
+    for col_idx, width in enumerate(col_widths, 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    ws.row_dimensions[1].height = 30
+    ws.row_dimensions[2].height = 20
+    ws.row_dimensions[3].height = 8  # Blank spacer row
+    ws.row_dimensions[HEADER_ROW].height = 24
+
+    # Freeze header row so it stays visible when scrolling
+    ws.freeze_panes = f"A{DATA_START}"
+
     # --- Title block ---
-    ws.merge_cells("A1:D1")
-    title_cell = ws["A1"]
-    title_cell.value = "DW3 Stellar Properties Boxel Size"
+    # Write-only sheets cannot merge cells, so the title lives in column A only
+    title_cell = WriteOnlyCell(ws, value=title)
     title_cell.font = title_font
     title_cell.alignment = Alignment(vertical="center")
-    ws.row_dimensions[1].height = 30
+    ws.append([title_cell])
 
-    ws.merge_cells("A2:D2")
-    sub_cell = ws["A2"]
-    sub_cell.value = f"CMDR {cmdr_name}  ·  Exported {datetime.utcnow().strftime('%Y-%m-%d %H:%M')} UTC"
+    sub_cell = WriteOnlyCell(ws, value=subtitle)
     sub_cell.font = subtitle_font
-    ws.row_dimensions[2].height = 20
+    ws.append([sub_cell])
 
-    # Blank spacer row
-    ws.row_dimensions[3].height = 8
+    ws.append([])
 
     # --- Header row (row 4) ---
-    HEADER_ROW = 4
-    headers = ["Timestamp", "Commander Name", "Highest System in Boxel", "Column 3"]
-    col_widths = [24, 28, 42, 14]
-
-    for col_idx, (header, width) in enumerate(zip(headers, col_widths), 1):
-        cell = ws.cell(row=HEADER_ROW, column=col_idx, value=header)
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
         cell.font = header_font
         cell.fill = header_fill
         cell.alignment = header_alignment
-        ws.column_dimensions[get_column_letter(col_idx)].width = width
-
-    ws.row_dimensions[HEADER_ROW].height = 24
+        header_cells.append(cell)
+    ws.append(header_cells)
 
     # --- Data rows ---
-    DATA_START = HEADER_ROW + 1
-    for i, d in enumerate(rows):
-        row_num = DATA_START + i
+    count = 0
+    for ts_value, row_cmdr, system in _row_values(rows, cmdr_name):
+        # Alternating row shading + subtle bottom border
+        ts_style, data_style = even_row_style if count % 2 == 0 else odd_row_style
 
-        # Timestamp
-        ts_str = d.get("created_at_utc") or ""
-        try:
-            if ts_str.endswith("Z"):
-                ts_str = ts_str[:-1] + "+00:00"
-            ts = datetime.fromisoformat(ts_str).replace(tzinfo=None)
-            ts_cell = ws.cell(row=row_num, column=1, value=ts)
-            ts_cell.number_format = "YYYY-MM-DD HH:MM:SS"
-        except Exception:
-            ts_cell = ws.cell(row=row_num, column=1, value=ts_str)
-        ts_cell.font = data_font_ts
-
-        # Commander name
-        cmdr_cell = ws.cell(row=row_num, column=2, value=d.get("cmdr_name") or cmdr_name)
-        cmdr_cell.font = data_font
-
-        # Highest system
-        sys_cell = ws.cell(row=row_num, column=3, value=(d.get("boxel_highest_system") or "").strip())
-        sys_cell.font = data_font
+        ts_cell = WriteOnlyCell(ws, value=ts_value)
+        ts_cell.style = ts_style
 
-        # Column 3 (empty)
-        ws.cell(row=row_num, column=4).font = data_font
+        cmdr_cell = WriteOnlyCell(ws, value=row_cmdr)
+        cmdr_cell.style = data_style
 
-        # Alternating row shading + subtle bottom border
-        if i % 2 == 0:
-            for col_idx in range(1, 5):
-                ws.cell(row=row_num, column=col_idx).fill = even_fill
+        sys_cell = WriteOnlyCell(ws, value=system)
+        sys_cell.style = data_style
 
-        for col_idx in range(1, 5):
-            ws.cell(row=row_num, column=col_idx).border = thin_border
+        # Column 3 (empty)
+        empty_cell = WriteOnlyCell(ws)
+        empty_cell.style = data_style
 
-    # Freeze header row so it stays visible when scrolling
-    ws.freeze_panes = f"A{DATA_START}"
+        ws.append([ts_cell, cmdr_cell, sys_cell, empty_cell])
+        count += 1
 
     # Auto-filter on the header row
-    ws.auto_filter.ref = f"A{HEADER_ROW}:D{HEADER_ROW + len(rows)}"
+    ws.auto_filter.ref = f"A{HEADER_ROW}:D{HEADER_ROW + count}"
 
     # --- Save ---
-    safe_cmdr = re.sub(r"[^A-Za-z0-9_-]", "_", cmdr_name or "UnknownCMDR")
-    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    filename = f"DW3_Stellar_Properties_Boxels_{safe_cmdr}_{ts}.xlsx"
-    file_path = output_dir / filename
-
     wb.save(file_path)
     return file_path
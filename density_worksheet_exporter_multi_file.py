@@ -14,12 +14,14 @@ Modified from original to support:
 
 from __future__ import annotations
 
-from dataclasses import asdict
+from dataclasses import asdict, is_dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Optional, Dict, Any, List
+from typing import Iterable, Optional, Dict, Any, List, Tuple
 from collections import defaultdict
 
+import io
+import math
 import sys
 import openpyxl
 import re
@@ -43,15 +45,74 @@ def resource_path(*parts: str) -> Path:
 
 template_path = resource_path("templates", "Stellar Density Scan Worksheet.xlsx")
 
+_SAFE_CMDR_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+# record_status values that exclude a note from the worksheet
+_INACTIVE_RECORD_STATES = frozenset({"amended", "deleted", "inactive"})
+
+# Rho denominators: sphere volume factor, and the fixed 20 ly sphere used when n < 50
+_SPHERE_K = 4 * math.pi / 3
+_SPHERE_20LY = _SPHERE_K * (20 ** 3)
+
+# R from Galactic Core (Sagittarius A* is approximately at -25.8, -20.5, 25900)
+# Using simplified galactic center coordinates: just a Z offset
+_GALACTIC_CORE_Z = 25900
+
+# Raw template bytes keyed by path -> (mtime_ns, size, data)
+_template_cache: Dict[Path, Tuple[int, int, bytes]] = {}
+
+
+def _load_template(path: Path) -> openpyxl.Workbook:
+    """Open a fresh workbook from the template, reading the file only when it changes."""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _template_cache.get(path)
+    if cached is None or cached[:2] != key:
+        cached = (*key, path.read_bytes())
+        _template_cache[path] = cached
+    return openpyxl.load_workbook(io.BytesIO(cached[2]))
+
 
 def _safe_parse_iso(ts: str) -> Optional[datetime]:
+    if not ts:
+        # Missing timestamps are common; skip the exception path
+        return None
     try:
-        # Handles both "...Z" and "+00:00"
-        if ts.endswith("Z"):
-            ts = ts[:-1] + "+00:00"
+        # Python 3.11+ parses both "...Z" and "+00:00" directly
         return datetime.fromisoformat(ts)
     except Exception:
-        return None
+        pass
+    try:
+        # Older interpreters reject a trailing "Z"
+        if ts.endswith("Z"):
+            return datetime.fromisoformat(ts[:-1] + "+00:00")
+    except Exception:
+        pass
+    return None
+
+
+def _note_as_dict(n: Any) -> Dict[str, Any]:
+    """Return a read-only dict view of a note (dict, dataclass or mapping)."""
+    if isinstance(n, dict):
+        return n
+    if is_dataclass(n) and hasattr(n, "__dict__"):
+        # Rows are only read, so the instance's own field dict is enough;
+        # asdict() would deep-copy nested fields like flags
+        return vars(n)
+    try:
+        return asdict(n)
+    except Exception:
+        return dict(n)
+
+
+def _row_sort_key(d: Dict[str, Any]):
+    """Sort key for worksheet rows: timestamp, then system_index."""
+    ts = _safe_parse_iso(str(d.get("timestamp_utc") or ""))
+    try:
+        si = int(d.get("system_index") or 0)
+    except Exception:
+        si = 0
+    return (ts or datetime.min, si)
 
 
 def _recalculate_formulas(file_path: Path, timeout: int = 30) -> bool:
@@ -148,29 +209,19 @@ def export_density_worksheet_from_notes_multi_file(
     output_path = Path(output_path)
     _cmdr = cmdr_name
 
-    # Normalize notes into dicts
-    normalized: List[Dict[str, Any]] = []
+    # Normalize, filter to valid density rows and group by sample_index in one pass
+    samples_dict: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    has_rows = False
     for n in notes:
         if n is None:
             continue
-        if isinstance(n, dict):
-            d = n
-        else:
-            try:
-                d = asdict(n)
-            except Exception:
-                d = dict(n)
-        normalized.append(d)
-
-    # Filter to valid density rows
-    all_rows: List[Dict[str, Any]] = []
-    for d in normalized:
+        d = _note_as_dict(n)
         if not (d.get("system_name") or ""):
             continue
         if d.get("max_distance") is None:
             continue
         rs = str(d.get("record_status", "")).lower()
-        if rs in ("amended", "deleted", "inactive"):
+        if rs in _INACTIVE_RECORD_STATES:
             continue
         # Filter by survey_type if specified
         if survey_type is not None:
@@ -187,49 +238,47 @@ def export_density_worksheet_from_notes_multi_file(
                 # (old notes without survey_type are assumed to be regular density)
                 if survey_type != SurveyType.REGULAR_DENSITY:
                     continue
-        all_rows.append(d)
+        has_rows = True
+        try:
+            sample_idx = int(d.get("sample_index"))
+        except Exception:
+            continue
+        samples_dict[sample_idx].append(d)
 
-    if not all_rows:
+    if not has_rows:
         survey_name = survey_type.value if survey_type else "any"
         raise ValueError(
             f"No completed samples to export for survey type '{survey_name}'. "
             "Save at least one observation with density data before exporting."
         )
 
-    # Group rows by sample_index
-    samples_dict: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
-    for row in all_rows:
-        try:
-            samples_dict[int(row.get("sample_index"))].append(row)
-        except Exception:
-            pass
-
     if not samples_dict:
         raise ValueError("No valid sample_index found in data. Cannot group samples.")
 
     created_files: List[Path] = []
 
-    safe_cmdr = re.sub(r"[^A-Za-z0-9_-]", "_", (_cmdr or "UnknownCMDR"))
+    safe_cmdr = _SAFE_CMDR_RE.sub("_", _cmdr or "UnknownCMDR")
     z_part = f"_Z{int(z_bin)}" if z_bin is not None else ""
 
     base_dir = output_path.parent if output_path.suffix.lower() == ".xlsx" else output_path
     base_dir.mkdir(parents=True, exist_ok=True)
 
+    # One timestamp per export so every sample file in the batch shares it
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    # Include survey type in filename for clarity
+    if survey_type == SurveyType.LOGARITHMIC_DENSITY:
+        survey_prefix = "DW3_Logarithmic_Density"
+    else:
+        survey_prefix = "DW3_Regular_Density"
+    name_prefix = f"{survey_prefix}_{safe_cmdr}{z_part}_Sample_"
+
     for sample_idx in sorted(samples_dict.keys()):
         rows = samples_dict[sample_idx]
 
-        # Sort rows by timestamp + system_index
-        def sort_key(d: Dict[str, Any]):
-            ts = _safe_parse_iso(str(d.get("timestamp_utc") or ""))
-            try:
-                si = int(d.get("system_index") or 0)
-            except Exception:
-                si = 0
-            return (ts or datetime.min, si)
+        # Sort rows by timestamp + system_index (shared module-level key)
+        rows.sort(key=_row_sort_key)
 
-        rows.sort(key=sort_key)
-
-        wb = openpyxl.load_workbook(template_path)
+        wb = _load_template(template_path)
         ws = wb[sheet_name] if sheet_name in wb.sheetnames else wb[wb.sheetnames[0]]
 
         START_ROW = 6
@@ -253,7 +302,11 @@ def export_density_worksheet_from_notes_multi_file(
             ws.cell(r, 1).value = d.get("system_name") or ""     # A System
             # Column B intentionally NOT written (static Z values)
 
-            ws.cell(r, 3).value = d.get("system_count")         # C System Count
+            # Template data cells in C and G-I are empty, so None values
+            # are skipped rather than materialising empty Cell objects
+            system_count = d.get("system_count")
+            if system_count is not None:
+                ws.cell(r, 3).value = system_count               # C System Count
 
             corrected = d.get("corrected_n")
             if corrected is None:
@@ -271,23 +324,19 @@ def export_density_worksheet_from_notes_multi_file(
             max_dist = d.get("max_distance")
             if corrected_n is not None and max_dist is not None:
                 try:
-                    import math
                     if corrected_n == 50:
                         # Rho = 50 / ((4*PI/3) * max_distance^3)
-                        rho = 50 / ((4 * math.pi / 3) * (max_dist ** 3))
+                        rho = 50 / (_SPHERE_K * (max_dist ** 3))
                     elif corrected_n < 50:
                         # Rho = corrected_n / ((4*pi/3) * 20^3)
-                        rho = corrected_n / ((4 * math.pi / 3) * (20 ** 3))
+                        rho = corrected_n / _SPHERE_20LY
                     else:
                         rho = None
                     
                     if rho is not None:
-                        # Set the calculated value as cached value for the formula cell
-                        cell_f = ws.cell(r, 6)  # Column F
-                        # The cell already has the formula from the template
-                        # We just need to make sure it has a cached value
+                        # The cell already has the formula from the template.
                         # openpyxl doesn't support setting cached values directly,
-                        # so we'll overwrite with the calculated value
+                        # so we overwrite column F with the calculated value
                         ws.cell(r, 6).value = rho
                 except Exception as e:
                     # If calculation fails, leave the formula as is
@@ -299,23 +348,22 @@ def export_density_worksheet_from_notes_multi_file(
             except Exception:
                 x = y = z = None
 
-            ws.cell(r, 7).value = x                              # G X
-            ws.cell(r, 8).value = y                              # H Y
-            ws.cell(r, 9).value = z                              # I Z
+            if x is not None:
+                ws.cell(r, 7).value = x                          # G X
+            if y is not None:
+                ws.cell(r, 8).value = y                          # H Y
+            if z is not None:
+                ws.cell(r, 9).value = z                          # I Z
 
             # Calculate Distance from Sol (column J) and R from Core (column K)
             # These replace formula-based calculations to avoid #NAME? errors
             if x is not None and y is not None and z is not None:
                 try:
-                    import math
                     # Distance from Sol (Sol is at 0, 0, 0)
                     dist_from_sol = math.sqrt(x**2 + y**2 + z**2)
                     ws.cell(r, 10).value = dist_from_sol          # J Dist from Sol
 
-                    # R from Galactic Core (Sagittarius A* is approximately at -25.8, -20.5, 25900)
-                    # Using simplified galactic center coordinates
-                    gc_x, gc_y, gc_z = 0, 0, 25900  # Simplified: just Z offset
-                    r_from_core = math.sqrt(x**2 + y**2 + (z - gc_z)**2)
+                    r_from_core = math.sqrt(x**2 + y**2 + (z - _GALACTIC_CORE_Z)**2)
                     ws.cell(r, 11).value = r_from_core            # K R from Core
                 except Exception:
                     pass  # Leave cells empty if calculation fails
@@ -338,14 +386,7 @@ def export_density_worksheet_from_notes_multi_file(
         wb.calculation.calcMode = 'auto'
         wb.calculation.fullCalcOnLoad = True
 
-        ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        # Include survey type in filename for clarity
-        if survey_type == SurveyType.LOGARITHMIC_DENSITY:
-            survey_prefix = "DW3_Logarithmic_Density"
-        else:
-            survey_prefix = "DW3_Regular_Density"
-        filename = f"{survey_prefix}_{safe_cmdr}{z_part}_Sample_{sample_idx:02d}_{ts}.xlsx"
-        file_path = base_dir / filename
+        file_path = base_dir / f"{name_prefix}{sample_idx:02d}_{ts}.xlsx"
 
         wb.save(file_path)
         created_files.append(file_path)
@@ -117,6 +117,66 @@ class UIConfig:
     led_idle: str = "#888888"
 
 
+# Legacy flat config keys: (dict key, AppConfig section or None, field name).
+# AppConfig.to_dict() is driven from this table, so adding a setting is one line.
+_LEGACY_CONFIG_KEYS = (
+    # Application info
+    ("APP_NAME", None, "app_name"),
+    ("VERSION", None, "version"),
+
+    # Paths
+    ("JOURNAL_DIR", "paths", "journal_dir"),
+    ("OUTDIR", "paths", "output_dir"),
+    ("DB_PATH", "paths", "db_path"),
+    ("OUTCSV", "paths", "csv_path"),
+    ("LOGFILE", "paths", "log_path"),
+    ("ASSET_PATH", "paths", "asset_path"),
+    ("ICON_NAME", "paths", "icon_name"),
+
+    # Monitoring
+    ("POLL_SECONDS_FAST", "monitoring", "poll_fast_seconds"),
+    ("POLL_SECONDS_SLOW", "monitoring", "poll_slow_seconds"),
+    ("TEST_MODE", "monitoring", "test_mode"),
+    ("TEST_READ_FROM_START", "monitoring", "test_read_from_start"),
+
+    # UI
+    ("UI_REFRESH_FAST_MS", "ui", "refresh_fast_ms"),
+    ("UI_REFRESH_SLOW_MS", "ui", "refresh_slow_ms"),
+    ("COMMS_MAX_LINES", "ui", "comms_max_lines"),
+
+    # Rating criteria
+    ("TEMP_A_MIN", "rating", "temp_a_min"),
+    ("TEMP_A_MAX", "rating", "temp_a_max"),
+    ("TEMP_B_MIN", "rating", "temp_b_min"),
+    ("TEMP_B_MAX", "rating", "temp_b_max"),
+    ("GRAV_A_MIN", "rating", "grav_a_min"),
+    ("GRAV_A_MAX", "rating", "grav_a_max"),
+    ("GRAV_B_MIN", "rating", "grav_b_min"),
+    ("GRAV_B_MAX", "rating", "grav_b_max"),
+    ("DIST_A_MAX", "rating", "dist_a_max"),
+    ("DIST_B_MAX", "rating", "dist_b_max"),
+    ("WORTH_DIST_MAX", "rating", "worth_dist_max"),
+    ("WORTH_TEMP_MIN", "rating", "worth_temp_min"),
+    ("WORTH_TEMP_MAX", "rating", "worth_temp_max"),
+    ("WORTH_GRAV_MAX", "rating", "worth_grav_max"),
+
+    # Colors
+    ("BG", "ui", "bg"),
+    ("BG_PANEL", "ui", "bg_panel"),
+    ("BG_FIELD", "ui", "bg_field"),
+    ("TEXT", "ui", "text"),
+    ("MUTED", "ui", "muted"),
+    ("BORDER_OUTER", "ui", "border_outer"),
+    ("BORDER_INNER", "ui", "border_inner"),
+    ("ORANGE", "ui", "orange"),
+    ("ORANGE_DIM", "ui", "orange_dim"),
+    ("GREEN", "ui", "green"),
+    ("RED", "ui", "red"),
+    ("LED_ACTIVE", "ui", "led_active"),
+    ("LED_IDLE", "ui", "led_idle"),
+)
+
+
 @dataclass
 class AppConfig:
     """Complete application configuration"""
@@ -141,62 +201,11 @@ class AppConfig:
     
     def to_dict(self) -> dict:
         """Convert to dictionary (for backward compatibility)"""
-        return {
-            # Application info
-            "APP_NAME": self.app_name,
-            "VERSION": self.version,
-            
-            # Paths
-            "JOURNAL_DIR": self.paths.journal_dir,
-            "OUTDIR": self.paths.output_dir,
-            "DB_PATH": self.paths.db_path,
-            "OUTCSV": self.paths.csv_path,
-            "LOGFILE": self.paths.log_path,
-            "ASSET_PATH": self.paths.asset_path,
-            "ICON_NAME": self.paths.icon_name,
-            
-            # Monitoring
-            "POLL_SECONDS_FAST": self.monitoring.poll_fast_seconds,
-            "POLL_SECONDS_SLOW": self.monitoring.poll_slow_seconds,
-            "TEST_MODE": self.monitoring.test_mode,
-            "TEST_READ_FROM_START": self.monitoring.test_read_from_start,
-            
-            # UI
-            "UI_REFRESH_FAST_MS": self.ui.refresh_fast_ms,
-            "UI_REFRESH_SLOW_MS": self.ui.refresh_slow_ms,
-            "COMMS_MAX_LINES": self.ui.comms_max_lines,
-            
-            # Rating criteria
-            "TEMP_A_MIN": self.rating.temp_a_min,
-            "TEMP_A_MAX": self.rating.temp_a_max,
-            "TEMP_B_MIN": self.rating.temp_b_min,
-            "TEMP_B_MAX": self.rating.temp_b_max,
-            "GRAV_A_MIN": self.rating.grav_a_min,
-            "GRAV_A_MAX": self.rating.grav_a_max,
-            "GRAV_B_MIN": self.rating.grav_b_min,
-            "GRAV_B_MAX": self.rating.grav_b_max,
-            "DIST_A_MAX": self.rating.dist_a_max,
-            "DIST_B_MAX": self.rating.dist_b_max,
-            "WORTH_DIST_MAX": self.rating.worth_dist_max,
-            "WORTH_TEMP_MIN": self.rating.worth_temp_min,
-            "WORTH_TEMP_MAX": self.rating.worth_temp_max,
-            "WORTH_GRAV_MAX": self.rating.worth_grav_max,
-            
-            # Colors
-            "BG": self.ui.bg,
-            "BG_PANEL": self.ui.bg_panel,
-            "BG_FIELD": self.ui.bg_field,
-            "TEXT": self.ui.text,
-            "MUTED": self.ui.muted,
-            "BORDER_OUTER": self.ui.border_outer,
-            "BORDER_INNER": self.ui.border_inner,
-            "ORANGE": self.ui.orange,
-            "ORANGE_DIM": self.ui.orange_dim,
-            "GREEN": self.ui.green,
-            "RED": self.ui.red,
-            "LED_ACTIVE": self.ui.led_active,
-            "LED_IDLE": self.ui.led_idle,
-        }
+        result = {}
+        for key, section, name in _LEGACY_CONFIG_KEYS:
+            source = getattr(self, section) if section else self
+            result[key] = getattr(source, name)
+        return result
 
 
 # ============================================================================
@@ -218,6 +227,10 @@ class IDatabase(Protocol):
         """Log a candidate"""
         ...
     
+    def log_candidates(self, candidates: list) -> list:
+        """Log several candidates in one transaction"""
+        ...
+    
     def get_cmdr_stats(self, cmdr_name: str) -> Optional[dict]:
         """Get commander statistics"""
         ...
@@ -226,6 +239,10 @@ class IDatabase(Protocol):
         """Get all commander statistics"""
         ...
     
+    def get_stats_totals(self) -> dict:
+        """Get counters summed across all commanders"""
+        ...
+    
     def load_seen_bodies(self, cmdr_name: Optional[str] = None) -> tuple[set, set]:
         """Load seen bodies"""
         ...
@@ -310,27 +327,16 @@ class FileLogger:
 
     def log(self, message: str):
         """Log a message"""
-        try:
-            self._logger.info(message)
-        except Exception as e:
-            logger.debug("FileLogger.log failed: %s", e)
-            pass
+        # No try/except: Handler.emit() routes write failures to handleError()
+        self._logger.info(message)
 
     def info(self, message: str):
         """Log info"""
-        try:
-            self._logger.info(message)
-        except Exception as e:
-            logger.debug("FileLogger.info failed: %s", e)
-            pass
+        self._logger.info(message)
 
     def error(self, message: str):
         """Log an error"""
-        try:
-            self._logger.error(message)
-        except Exception as e:
-            logger.debug("FileLogger.error failed: %s", e)
-            pass
+        self._logger.error(message)
 
 # ============================================================================
 # DEPENDENCY CONTAINER
@@ -35,9 +35,10 @@ import time
 import hashlib
 import threading
 import queue
-from dataclasses import dataclass
+import operator
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Callable, Tuple
+from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime, timezone
 
 import logging
@@ -47,9 +48,9 @@ logger = logging.getLogger("dw3.earth2_database")
 # ============================================================================
 # SQL INSERT BINDING KEYS
 # ============================================================================
-# Keep this list in sync with the named placeholders used in the INSERT inside
-# Earth2Database.log_candidate(). Prefilling these keys prevents sqlite3 from
-# raising: "You did not supply a value for binding parameter :<name>"
+# Keep this list in the same order as the column list in
+# _INSERT_CANDIDATE_SQL below; values are bound positionally in this order.
+# Prefilling these keys keeps candidates with missing fields bindable.
 CANDIDATE_INSERT_KEYS = [
     "timestamp_utc",
     "event",
@@ -95,16 +96,110 @@ CANDIDATE_INSERT_KEYS = [
     "cmdr_name",
     "session_id",
 ]
+
+# earth2_rating category -> commander_stats counter column
+_RATING_STAT_COLUMNS = {
+    "Earth Twin": "total_earth_twin",
+    "Excellent": "total_excellent",
+    "Very Good": "total_very_good",
+    "Good": "total_good",
+    "Fair": "total_fair",
+    "Marginal": "total_marginal",
+    "Poor": "total_poor",
+    "Unknown": "total_unknown",
+}
+
+# commander_stats counters, in table order
+_COMMANDER_STAT_COLUMNS = (
+    "total_all",
+    "total_elw",
+    "total_terraformable",
+    "total_earth_twin",
+    "total_excellent",
+    "total_very_good",
+    "total_good",
+    "total_fair",
+    "total_marginal",
+    "total_poor",
+    "total_unknown",
+)
+
+# One UPSERT for every stats bump: a new commander starts at the deltas, an
+# existing one adds them
+_UPSERT_COMMANDER_STATS_SQL = """
+    INSERT INTO commander_stats (cmdr_name, {columns}, last_updated)
+    VALUES (?, {placeholders}, CURRENT_TIMESTAMP)
+    ON CONFLICT(cmdr_name) DO UPDATE SET
+        {assignments},
+        last_updated = CURRENT_TIMESTAMP
+""".format(
+    columns=", ".join(_COMMANDER_STAT_COLUMNS),
+    placeholders=", ".join("?" for _ in _COMMANDER_STAT_COLUMNS),
+    assignments=",\n        ".join(
+        f"{col} = {col} + excluded.{col}" for col in _COMMANDER_STAT_COLUMNS
+    ),
+)
+
+# Every counter summed across all commanders (0 when the table is empty)
+_SUM_COMMANDER_STATS_SQL = """
+    SELECT
+        {sums}
+    FROM commander_stats
+""".format(
+    sums=",\n        ".join(
+        f"COALESCE(SUM({col}), 0) AS {col}" for col in _COMMANDER_STAT_COLUMNS
+    ),
+)
+
+# Prefill template: every INSERT key mapped to None, merged under the caller's data
+_CANDIDATE_INSERT_DEFAULTS = dict.fromkeys(CANDIDATE_INSERT_KEYS)
+
+# Shared by log_candidate() and log_candidates() so both paths bind the same
+# columns in the same order.
+_INSERT_CANDIDATE_SQL = """
+    INSERT OR IGNORE INTO candidates (
+        timestamp_utc, event, event_id, system_address,
+        star_system, body_name, body_id,
+        distance_from_arrival_ls, candidate_type, terraform_state,
+        planet_class, atmosphere, volcanism, mass_em, radius_km,
+        surface_gravity_g, surface_temp_k, surface_pressure_atm,
+        landable, tidal_lock, rotation_period_days, orbital_period_days,
+        semi_major_axis_au, orbital_eccentricity, orbital_inclination_deg,
+        arg_of_periapsis_deg, ascending_node_deg, mean_anomaly_deg,
+        axial_tilt_deg, was_discovered, was_mapped,
+        earth2_rating, similarity_score, goldilocks_score,
+        goldilocks_category, worth_landing, worth_reason,
+        distance_from_sol_ly, star_pos_x, star_pos_y, star_pos_z,
+        cmdr_name, session_id
+    ) VALUES (
+        {placeholders}
+    )
+""".format(placeholders=", ".join("?" for _ in CANDIDATE_INSERT_KEYS))
+
+# Pulls the INSERT values out of a prepared candidate in CANDIDATE_INSERT_KEYS
+# order; positional binding skips sqlite3's per-name parameter lookup
+_candidate_insert_row = operator.itemgetter(*CANDIDATE_INSERT_KEYS)
+
+# Rows per worker round-trip when streaming export_to_csv()
+_CSV_EXPORT_BATCH_ROWS = 5000
  
 
 # ============================================================================
 # INTERNAL TASK TYPES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
+class _Reply:
+    """Single-shot result slot: the worker fills it, then sets the event."""
+    event: threading.Event = field(default_factory=threading.Event)
+    ok: bool = False
+    value: Any = None
+
+
+@dataclass(slots=True)
 class _DBTask:
     fn: Callable[[sqlite3.Connection], Any]
-    reply_q: "queue.Queue[Tuple[bool, Any]]"
+    reply: _Reply
 
 
 # ============================================================================
@@ -144,7 +239,9 @@ class Earth2Database:
     # Worker plumbing
     # ------------------------------------------------------------------------
     def _worker_loop(self):
-        conn = sqlite3.connect(str(self.db_path))
+        # Larger prepared-statement cache: the fixed INSERT/UPSERT constants
+        # stay compiled across tasks alongside the one-off report queries
+        conn = sqlite3.connect(str(self.db_path), cached_statements=256)
         conn.row_factory = sqlite3.Row
 
         # Pragmas: stable + fast enough, and avoids 'database is locked' spikes
@@ -156,6 +253,13 @@ class Earth2Database:
             pass
         conn.execute("PRAGMA synchronous=NORMAL;")
         conn.execute("PRAGMA busy_timeout=3000;")
+        # Memory-map reads (up to 64 MiB) instead of copying pages via read()
+        conn.execute("PRAGMA mmap_size=67108864;")
+        # Checkpoint the WAL back into the main file every ~1000 pages
+        conn.execute("PRAGMA wal_autocheckpoint=1000;")
+        # 64 MiB page cache; sorts and temp indexes stay in RAM
+        conn.execute("PRAGMA cache_size=-64000;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
 
         while True:
             task = self._task_q.get()
@@ -164,9 +268,26 @@ class Earth2Database:
 
             try:
                 result = task.fn(conn)
-                task.reply_q.put((True, result))
+                task.reply.ok = True
+                task.reply.value = result
             except Exception as e:
-                task.reply_q.put((False, e))
+                task.reply.value = e
+            task.reply.event.set()
+
+        # Refresh planner statistics for the next start; analysis_limit keeps
+        # this to a bounded sample instead of a full ANALYZE
+        try:
+            conn.execute("PRAGMA analysis_limit=400;")
+            conn.execute("PRAGMA optimize;")
+        except Exception as e:
+            logger.debug("PRAGMA optimize failed: %s", e)
+
+        # Fold the WAL into the main file and truncate it, so the -wal file
+        # left on disk between runs stays small
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        except Exception as e:
+            logger.debug("WAL checkpoint failed: %s", e)
 
         try:
             conn.close()
@@ -178,13 +299,13 @@ class Earth2Database:
         if self._closed:
             raise RuntimeError("Earth2Database is closed")
 
-        reply_q: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(maxsize=1)
-        self._task_q.put(_DBTask(fn=fn, reply_q=reply_q))
+        reply = _Reply()
+        self._task_q.put(_DBTask(fn=fn, reply=reply))
 
-        ok, payload = reply_q.get()
-        if ok:
-            return payload
-        raise payload
+        reply.event.wait()
+        if reply.ok:
+            return reply.value
+        raise reply.value
 
     # ------------------------------------------------------------------------
     # Schema / helpers
@@ -244,44 +365,21 @@ class Earth2Database:
                     )
                 """)
         
-                # Add similarity_score column if it doesn't exist (for existing databases)
-                try:
-                    conn.execute("ALTER TABLE candidates ADD COLUMN similarity_score REAL")
-                    conn.commit()
-                except sqlite3.OperationalError as e:
-                    logger.debug("Migration: similarity_score column: %s", e)
-                    pass  # Column already exists
-
-                # Add goldilocks columns if they don't exist
-                try:
-                    conn.execute("ALTER TABLE candidates ADD COLUMN goldilocks_score INTEGER")
-                    conn.commit()
-                except sqlite3.OperationalError as e:
-                    logger.debug("Migration: goldilocks_score column: %s", e)
-                    pass
-
-                try:
-                    conn.execute("ALTER TABLE candidates ADD COLUMN goldilocks_category TEXT")
-                    conn.commit()
-                except sqlite3.OperationalError as e:
-                    logger.debug("Migration: goldilocks_category column: %s", e)
-                    pass
-
-                # Add event_id column for linking to observer_notes
-                try:
-                    conn.execute("ALTER TABLE candidates ADD COLUMN event_id TEXT")
-                    conn.commit()
-                except sqlite3.OperationalError as e:
-                    logger.debug("Migration: event_id column: %s", e)
-                    pass
-
-                # Add system_address column (game's unique system ID)
-                try:
-                    conn.execute("ALTER TABLE candidates ADD COLUMN system_address INTEGER")
-                    conn.commit()
-                except sqlite3.OperationalError as e:
-                    logger.debug("Migration: system_address column: %s", e)
-                    pass
+                # Columns added after the first release; read the live column
+                # list once instead of retrying ALTER TABLE for each of them
+                existing_columns = {
+                    row[1] for row in conn.execute("PRAGMA table_info(candidates)")
+                }
+                for column, column_type in (
+                    ("similarity_score", "REAL"),
+                    ("goldilocks_score", "INTEGER"),
+                    ("goldilocks_category", "TEXT"),
+                    ("event_id", "TEXT"),            # links to observer_notes
+                    ("system_address", "INTEGER"),   # game's unique system ID
+                ):
+                    if column not in existing_columns:
+                        conn.execute(f"ALTER TABLE candidates ADD COLUMN {column} {column_type}")
+                        logger.debug("Migration: added %s column", column)
 
                 # Create index on event_id for fast joins with observer_notes
                 try:
@@ -363,132 +461,127 @@ class Earth2Database:
 
 
 
-    def _update_commander_stats(self, conn: sqlite3.Connection, candidate_data: Dict[str, Any]):
-                """Update commander statistics"""
-                cmdr_name = candidate_data.get("cmdr_name", "")
-                if not cmdr_name:
-                    return
-        
-                # Ensure commander exists
-                conn.execute("""
-                    INSERT OR IGNORE INTO commander_stats (cmdr_name, total_all)
-                    VALUES (?, 0)
-                """, (cmdr_name,))
-        
-                # Update counts
-                conn.execute("""
-                    UPDATE commander_stats
-                    SET total_all = total_all + 1,
-                        last_updated = CURRENT_TIMESTAMP
-                    WHERE cmdr_name = ?
-                """, (cmdr_name,))
-        
-                # Update type-specific counts
-                candidate_type = candidate_data.get("candidate_type", "")
-                if "ELW" in candidate_type:
-                    conn.execute("""
-                        UPDATE commander_stats
-                        SET total_elw = total_elw + 1
-                        WHERE cmdr_name = ?
-                    """, (cmdr_name,))
-                elif "Terraformable" in candidate_type:
-                    conn.execute("""
-                        UPDATE commander_stats
-                        SET total_terraformable = total_terraformable + 1
-                        WHERE cmdr_name = ?
-                    """, (cmdr_name,))
-        
-                # Update rating counts (using new category system)
-                rating = candidate_data.get("earth2_rating", "Unknown")
-        
-                # Map category to database column
-                rating_columns = {
-                    "Earth Twin": "total_earth_twin",
-                    "Excellent": "total_excellent",
-                    "Very Good": "total_very_good",
-                    "Good": "total_good",
-                    "Fair": "total_fair",
-                    "Marginal": "total_marginal",
-                    "Poor": "total_poor",
-                    "Unknown": "total_unknown"
-                }
-        
-                column_name = rating_columns.get(rating, "total_unknown")
-        
-                conn.execute(f"""
-                    UPDATE commander_stats
-                    SET {column_name} = {column_name} + 1
-                    WHERE cmdr_name = ?
-                """, (cmdr_name,))
-        
-                conn.commit()
+    def _commander_stat_columns(self, candidate_data: Dict[str, Any]) -> List[str]:
+        """commander_stats counters that one new candidate increments"""
+        columns = ["total_all"]
 
+        # Type-specific counts
+        candidate_type = candidate_data.get("candidate_type") or ""
+        if "ELW" in candidate_type:
+            columns.append("total_elw")
+        elif "Terraformable" in candidate_type:
+            columns.append("total_terraformable")
 
+        # Rating counts (using new category system)
+        rating = candidate_data.get("earth2_rating", "Unknown")
+        columns.append(_RATING_STAT_COLUMNS.get(rating, "total_unknown"))
+        return columns
 
-    # ------------------------------------------------------------------------
-    # Public API (same as before)
-    # ------------------------------------------------------------------------
-    def log_candidate(self, candidate_data: Dict[str, Any]) -> bool:
-        """Log a candidate to database. Returns True if new candidate, False if duplicate."""
+    def _add_commander_stats(self, conn: sqlite3.Connection, cmdr_name: str, deltas: Dict[str, int]):
+        """Add per-column deltas to a commander's stats row (created if missing)"""
+        # Counters missing from deltas add 0, so every call binds the same
+        # statement whatever the rating/type mix
+        conn.execute(
+            _UPSERT_COMMANDER_STATS_SQL,
+            (cmdr_name, *(deltas.get(col, 0) for col in _COMMANDER_STAT_COLUMNS)),
+        )
+
+    def _update_commander_stats(self, conn: sqlite3.Connection, candidate_data: Dict[str, Any]):
+        """Update commander statistics"""
+        cmdr_name = candidate_data.get("cmdr_name", "")
+        if not cmdr_name:
+            return
+        deltas = dict.fromkeys(self._commander_stat_columns(candidate_data), 1)
+        self._add_commander_stats(conn, cmdr_name, deltas)
+
+    def _prepare_candidate(self, candidate_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of candidate_data with event_id and every INSERT key set."""
         # Compute deterministic event_id outside worker (pure function)
         event_id = candidate_data.get("event_id")
         if not event_id:
             event_id = self._generate_event_id(candidate_data)
-        candidate_data = dict(candidate_data)
-        candidate_data["event_id"] = event_id
 
         # Defensive defaults for named SQL bindings.
         # If a key used in the INSERT is missing, sqlite3 raises:
         #   "You did not supply a value for binding parameter :<name>"
         # Import paths (e.g. import_journals.py) may omit newer fields.
-        for key in CANDIDATE_INSERT_KEYS:
-            candidate_data.setdefault(key, None)
+        prepared = {**_CANDIDATE_INSERT_DEFAULTS, **candidate_data}
+        prepared["event_id"] = event_id
+        return prepared
+
+    def _insert_candidate(
+        self,
+        conn: sqlite3.Connection,
+        candidate_data: Dict[str, Any],
+        update_stats: bool = True,
+    ) -> bool:
+        """Insert one prepared candidate and bump stats. Caller owns the commit."""
+        # UNIQUE(star_system, body_name, cmdr_name) is the only constraint on
+        # candidates, so an ignored row (rowcount 0) means a duplicate
+        inserted = conn.execute(
+            _INSERT_CANDIDATE_SQL, _candidate_insert_row(candidate_data)
+        ).rowcount == 1
+        if not inserted:
+            return False
+
+        # Update stats in the same transaction as the insert
+        if update_stats:
+            self._update_commander_stats(conn, candidate_data)
+        return True
+
+    # ------------------------------------------------------------------------
+    # Public API (same as before)
+    # ------------------------------------------------------------------------
+    def log_candidate(self, candidate_data: Dict[str, Any]) -> bool:
+        """Log a candidate to database. Returns True if new candidate, False if duplicate."""
+        candidate_data = self._prepare_candidate(candidate_data)
 
         def _task(conn: sqlite3.Connection):
             try:
-                cursor = conn.execute("""
-                    INSERT INTO candidates (
-                        timestamp_utc, event, event_id, system_address,
-                        star_system, body_name, body_id,
-                        distance_from_arrival_ls, candidate_type, terraform_state,
-                        planet_class, atmosphere, volcanism, mass_em, radius_km,
-                        surface_gravity_g, surface_temp_k, surface_pressure_atm,
-                        landable, tidal_lock, rotation_period_days, orbital_period_days,
-                        semi_major_axis_au, orbital_eccentricity, orbital_inclination_deg,
-                        arg_of_periapsis_deg, ascending_node_deg, mean_anomaly_deg,
-                        axial_tilt_deg, was_discovered, was_mapped,
-                        earth2_rating, similarity_score, goldilocks_score,
-                        goldilocks_category, worth_landing, worth_reason,
-                        distance_from_sol_ly, star_pos_x, star_pos_y, star_pos_z,
-                        cmdr_name, session_id
-                    ) VALUES (
-                        :timestamp_utc, :event, :event_id, :system_address,
-                        :star_system, :body_name, :body_id,
-                        :distance_from_arrival_ls, :candidate_type, :terraform_state,
-                        :planet_class, :atmosphere, :volcanism, :mass_em, :radius_km,
-                        :surface_gravity_g, :surface_temp_k, :surface_pressure_atm,
-                        :landable, :tidal_lock, :rotation_period_days, :orbital_period_days,
-                        :semi_major_axis_au, :orbital_eccentricity, :orbital_inclination_deg,
-                        :arg_of_periapsis_deg, :ascending_node_deg, :mean_anomaly_deg,
-                        :axial_tilt_deg, :was_discovered, :was_mapped,
-                        :earth2_rating, :similarity_score, :goldilocks_score,
-                        :goldilocks_category, :worth_landing, :worth_reason,
-                        :distance_from_sol_ly, :star_pos_x, :star_pos_y, :star_pos_z,
-                        :cmdr_name, :session_id
-                    )
-                """, candidate_data)
+                was_new = self._insert_candidate(conn, candidate_data)
                 conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return was_new
 
-                # Update stats in same transaction window
-                self._update_commander_stats(conn, candidate_data)
-                conn.commit()
+        return bool(self._submit(_task))
 
-                return True
-            except sqlite3.IntegrityError:
-                # Duplicate due to UNIQUE constraint
-                return False
+    def log_candidates(self, candidates: List[Dict[str, Any]]) -> List[bool]:
+        """Log many candidates in one transaction.
 
-        return bool(self._submit(_task))
+        Bulk paths (journal import) use this so a whole batch costs a single
+        commit instead of one per candidate.
+
+        Returns:
+            One flag per input candidate: True if new, False if duplicate
+        """
+        if not candidates:
+            return []
+        prepared = [self._prepare_candidate(c) for c in candidates]
+
+        def _task(conn: sqlite3.Connection):
+            try:
+                results = []
+                # Stats deltas per commander, applied once after the inserts
+                deltas: Dict[str, Dict[str, int]] = {}
+                for c in prepared:
+                    was_new = self._insert_candidate(conn, c, update_stats=False)
+                    results.append(was_new)
+                    if was_new and c.get("cmdr_name"):
+                        counts = deltas.setdefault(c["cmdr_name"], {})
+                        for col in self._commander_stat_columns(c):
+                            counts[col] = counts.get(col, 0) + 1
+
+                for cmdr_name, counts in deltas.items():
+                    self._add_commander_stats(conn, cmdr_name, counts)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return results
+
+        return list(self._submit(_task))
 
     def get_candidates_with_observations(
         self,
@@ -613,23 +706,26 @@ class Earth2Database:
                         WHERE event_id IS NULL OR event_id = ''
                     """)
 
-                    count = 0
-                    for row in cursor.fetchall():
-                        event_id = self._generate_event_id({
-                            'timestamp_utc': row['timestamp_utc'],
-                            'event': row['event'],
-                            'system_address': row['system_address'],
-                            'body_id': row['body_id'],
-                        })
-
-                        conn.execute(
-                            "UPDATE candidates SET event_id = ? WHERE id = ?",
-                            (event_id, row['id'])
+                    # Compute every ID first, then apply them in one executemany
+                    updates = [
+                        (
+                            self._generate_event_id({
+                                'timestamp_utc': row['timestamp_utc'],
+                                'event': row['event'],
+                                'system_address': row['system_address'],
+                                'body_id': row['body_id'],
+                            }),
+                            row['id'],
                         )
-                        count += 1
+                        for row in cursor.fetchall()
+                    ]
 
+                    conn.executemany(
+                        "UPDATE candidates SET event_id = ? WHERE id = ?",
+                        updates
+                    )
                     conn.commit()
-                    return count
+                    return len(updates)
 
                 # ========================================================================
                 # SESSION OPERATIONS
@@ -734,11 +830,24 @@ class Earth2Database:
 
         return self._submit(_task)
 
+    def get_stats_totals(self) -> Dict[str, int]:
+        """Sum every commander_stats counter across all commanders in one query."""
+
+        def _task(conn: sqlite3.Connection):
+            row = conn.execute(_SUM_COMMANDER_STATS_SQL).fetchone()
+            return dict(row)
+
+        return self._submit(_task)
+
     def export_to_csv(self, csv_path: Path, cmdr_name: Optional[str] = None):
-        """Export candidates to CSV. Query happens in worker, file write happens in caller thread."""
+        """Export candidates to CSV. Query happens in worker, file write happens in caller thread.
+
+        Rows come back from the worker in fetchmany() batches, so memory use
+        stays flat and other DB calls can run between batches.
+        """
         import csv
 
-        def _fetch(conn: sqlite3.Connection):
+        def _query(conn: sqlite3.Connection):
             if cmdr_name:
                 cursor = conn.execute("""
                     SELECT * FROM candidates
@@ -750,19 +859,25 @@ class Earth2Database:
                     SELECT * FROM candidates
                     ORDER BY timestamp_utc
                 """)
-            columns = [description[0] for description in cursor.description]
-            rows = [dict(row) for row in cursor.fetchall()]
-            return columns, rows
-
-        columns, rows = self._submit(_fetch)
-
-        csv_path = Path(csv_path)
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-        with csv_path.open('w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=columns)
-            writer.writeheader()
-            for row in rows:
-                writer.writerow(row)
+            return cursor, [description[0] for description in cursor.description]
+
+        # The cursor is only ever used on the worker, via the tasks below
+        cursor, columns = self._submit(_query)
+        try:
+            csv_path = Path(csv_path)
+            csv_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # 1 MiB buffer: a full export becomes a handful of write() calls
+            with csv_path.open('w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                while True:
+                    rows = self._submit(lambda conn: cursor.fetchmany(_CSV_EXPORT_BATCH_ROWS))
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+        finally:
+            self._submit(lambda conn: cursor.close())
 
     def close(self):
         """Stop the DB worker thread and close down safely.
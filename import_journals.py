@@ -60,6 +60,10 @@ class JournalImporter:
         self.errors = 0
         self.error_details: List[str] = []  # Store error details for user visibility
 
+        # Candidates built from the current journal file, inserted in one
+        # transaction by _flush_pending() when the file is done
+        self._pending: List[Dict[str, Any]] = []
+
     @staticmethod
     def _safe_float(value, default: float = 0.0) -> float:
         """Safely convert a value to float, handling None and invalid types."""
@@ -123,11 +127,20 @@ class JournalImporter:
     def _process_journal_file(self, journal_file: Path, cmdr_filter: str = None):
         """Process a single journal file"""
         self._log(f"Processing: {journal_file.name}")
-        
+
+        try:
+            self._read_journal_file(journal_file, cmdr_filter)
+        finally:
+            self._flush_pending()
+
+        self.files_processed += 1
+
+    def _read_journal_file(self, journal_file: Path, cmdr_filter: str = None):
+        """Parse a journal file, queueing candidates in self._pending"""
         current_cmdr = None
         current_system = None
         star_pos = None
-        
+
         with open(journal_file, 'r', encoding='utf-8') as f:
             for line_num, line in enumerate(f, 1):
                 try:
@@ -171,8 +184,6 @@ class JournalImporter:
                     self.errors += 1
                     if len(self.error_details) < 10:  # Limit stored details
                         self.error_details.append(error_msg)
-        
-        self.files_processed += 1
     
     def _format_atmosphere(self, event: Dict[str, Any]) -> str:
         """Format atmosphere information from scan event"""
@@ -308,33 +319,59 @@ class JournalImporter:
         candidate_data["worth_landing"] = worth
         candidate_data["worth_reason"] = reason
         
-        # Try to insert into database
+        # Queue for the per-file batch insert
+        self._pending.append(candidate_data)
+
+    def _flush_pending(self):
+        """Insert queued candidates in a single transaction and report each one"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
         try:
-            was_new = self.database.log_candidate(candidate_data)
-            
+            results = self.database.log_candidates(pending)
+        except Exception as e:
+            # Batch rolled back; retry one by one so a single bad row is
+            # reported on its own instead of failing the whole file
+            _logger.debug("Batch insert failed, retrying per candidate: %s", e)
+            results = [self._log_single(c) for c in pending]
+
+        for candidate_data, was_new in zip(pending, results):
+            if was_new is None:
+                continue
             if was_new:
                 self.candidates_found += 1
-                
+
                 # Format output with both scores
                 score_text = ""
+                similarity_score = candidate_data.get("similarity_score", -1)
                 if similarity_score >= 0:
                     score_text += f" Sim:{similarity_score:.1f}"
-                
+
                 goldilocks_score = candidate_data.get("goldilocks_score", -1)
                 if goldilocks_score >= 0:
                     stars = "⭐" * min(goldilocks_score // 3, 5)
                     score_text += f" | Gold:{goldilocks_score}/16 {stars}"
-                
-                self._log(f"    ✓ {body_name} ({rating}{score_text}) - {candidate_data['candidate_type']}")
+
+                self._log(
+                    f"    ✓ {candidate_data['body_name']} "
+                    f"({candidate_data['earth2_rating']}{score_text}) - {candidate_data['candidate_type']}"
+                )
             else:
                 self.duplicates_skipped += 1
-        
+
+    def _log_single(self, candidate_data: Dict[str, Any]):
+        """Insert one candidate; returns None (and records the error) on failure"""
+        body_name = candidate_data.get("body_name", "")
+        try:
+            return self.database.log_candidate(candidate_data)
         except Exception as e:
             error_msg = f"DB insert failed for {body_name}: {type(e).__name__}"
             self._log(f"    ✗ Failed to log {body_name}: {e}")
             self.errors += 1
             if len(self.error_details) < 10:
                 self.error_details.append(error_msg)
+            return None
 
     def _get_stats(self) -> Dict[str, Any]:
         """Get import statistics"""
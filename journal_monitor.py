@@ -33,6 +33,12 @@ from observer_models import generate_event_id
 import logging
 logger = logging.getLogger("dw3.journal_monitor")
 
+# Events used to seed state, as they appear (quoted) in raw journal lines.
+# A line that contains none of these can't be one of them, so it is skipped
+# without paying for a JSON decode.
+_SEED_EVENTS = frozenset({"Commander", "LoadGame", "Location", "FSDJump"})
+_SEED_EVENT_MARKERS = tuple(f'"{name}"' for name in sorted(_SEED_EVENTS))
+
 
 # ============================================================================
 # JOURNAL FILE READER
@@ -162,7 +168,8 @@ class JournalFileReader:
                 data = f.read(self.seed_max_bytes)
                 
                 for line in data.splitlines():
-                    if not line.strip():
+                    # Cheap substring pre-filter: most lines are Scan/FSS/etc.
+                    if not any(marker in line for marker in _SEED_EVENT_MARKERS):
                         continue
                     
                     try:
@@ -170,7 +177,7 @@ class JournalFileReader:
                         event_type = evt.get("event", "")
                         
                         # Only collect state-relevant events
-                        if event_type in {"Commander", "LoadGame", "Location", "FSDJump"}:
+                        if event_type in _SEED_EVENTS:
                             events.append(evt)
                     except Exception as e:
                         logger.debug("seed_initial_state: skipping line: %s", e)
@@ -490,18 +497,19 @@ class JournalMonitor:
         # Read NavRoute.json to get the target's StarPos
         try:
             nav_route_path = self.journal_dir / "NavRoute.json"
-            if nav_route_path.exists():
-                with open(nav_route_path, "r", encoding="utf-8") as f:
-                    route_data = json.loads(f.read())
-                route = route_data.get("Route", [])
-                # Find the matching system in the route (usually the last entry for final dest,
-                # or the next waypoint matching the FSDTarget name)
-                for waypoint in route:
-                    if waypoint.get("StarSystem") == target_name:
-                        sp = waypoint.get("StarPos")
-                        if isinstance(sp, list) and len(sp) == 3:
-                            star_pos = (float(sp[0]), float(sp[1]), float(sp[2]))
-                        break
+            with open(nav_route_path, "r", encoding="utf-8") as f:
+                route_data = json.load(f)
+            route = route_data.get("Route", [])
+            # Find the matching system in the route (usually the last entry for final dest,
+            # or the next waypoint matching the FSDTarget name)
+            for waypoint in route:
+                if waypoint.get("StarSystem") == target_name:
+                    sp = waypoint.get("StarPos")
+                    if isinstance(sp, list) and len(sp) == 3:
+                        star_pos = (float(sp[0]), float(sp[1]), float(sp[2]))
+                    break
+        except FileNotFoundError:
+            pass  # No plotted route
         except Exception as e:
             logger.debug("NavRoute.json read failed: %s", e)
 
@@ -19,7 +19,7 @@ Design:
 # ============================================================================
 
 import hashlib
-from threading import Lock, RLock
+from threading import Lock
 from typing import Optional, Tuple, List, Callable, Dict, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -129,7 +129,7 @@ class JournalStateManager:
         Args:
             z_bin_size: Size of Z-bins in light-years (default 50)
         """
-        self._lock = RLock()  # Reentrant lock for nested calls
+        self._lock = Lock()  # Every locked method is a leaf; callbacks run unlocked
         self._z_bin_size = z_bin_size
 
         # Internal mutable state
@@ -95,7 +95,7 @@ class Earth2Model:
         
         # Cache for expensive operations
         self._rating_cache = None
-        self._rating_cache_time = 0
+        self._rating_cache_expires_at = 0.0
         self._rating_cache_ttl = 60  # Cache for 60 seconds
         
     # ========================================================================
@@ -285,12 +285,12 @@ class Earth2Model:
                     })
                     return
             
-            # If no CMDR or multi-CMDR, sum all
-            all_stats = self.db.get_all_cmdr_stats()
+            # If no CMDR or multi-CMDR, sum all (aggregated in SQL)
+            totals = self.db.get_stats_totals()
             self.update_stats({
-                "total_all": sum(s["total_all"] for s in all_stats),
-                "total_elw": sum(s["total_elw"] for s in all_stats),
-                "total_terraformable": sum(s["total_terraformable"] for s in all_stats),
+                "total_all": totals["total_all"],
+                "total_elw": totals["total_elw"],
+                "total_terraformable": totals["total_terraformable"],
             })
         except Exception as e:
             self._log_error(f"Failed to load stats from database: {e}")
@@ -306,9 +306,9 @@ class Earth2Model:
             Dictionary with counts for each rating
         """
         # Check cache
-        current_time = time.time()
+        current_time = time.monotonic()  # immune to wall-clock adjustments
         if not force_refresh and self._rating_cache is not None:
-            if current_time - self._rating_cache_time < self._rating_cache_ttl:
+            if current_time < self._rating_cache_expires_at:
                 return self._rating_cache
         
         # Load from database - count candidates by their stored ratings
@@ -325,26 +325,23 @@ class Earth2Model:
         }
         
         try:
-            # Query database for all commander stats
-            all_stats = self.db.get_all_cmdr_stats()
-            
-            # Sum up ratings from all commanders
-            for cmdr_stats in all_stats:
-                ratings["Earth Twin"] += cmdr_stats.get("total_earth_twin", 0)
-                ratings["Excellent"] += cmdr_stats.get("total_excellent", 0)
-                ratings["Very Good"] += cmdr_stats.get("total_very_good", 0)
-                ratings["Good"] += cmdr_stats.get("total_good", 0)
-                ratings["Fair"] += cmdr_stats.get("total_fair", 0)
-                ratings["Marginal"] += cmdr_stats.get("total_marginal", 0)
-                ratings["Poor"] += cmdr_stats.get("total_poor", 0)
-                ratings["Unknown"] += cmdr_stats.get("total_unknown", 0)
+            # Rating totals across all commanders, summed by SQLite
+            totals = self.db.get_stats_totals()
+            ratings["Earth Twin"] = totals["total_earth_twin"]
+            ratings["Excellent"] = totals["total_excellent"]
+            ratings["Very Good"] = totals["total_very_good"]
+            ratings["Good"] = totals["total_good"]
+            ratings["Fair"] = totals["total_fair"]
+            ratings["Marginal"] = totals["total_marginal"]
+            ratings["Poor"] = totals["total_poor"]
+            ratings["Unknown"] = totals["total_unknown"]
             
         except Exception as e:
             self._log_error(f"Failed to load rating distribution: {e}")
         
         # Update cache
         self._rating_cache = ratings
-        self._rating_cache_time = current_time
+        self._rating_cache_expires_at = current_time + self._rating_cache_ttl
         
         return ratings
     
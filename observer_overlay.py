@@ -41,12 +41,31 @@ from observer_models import (
     SURVEY_AXIS_INDEX,
 )
 from journal_state_manager import CurrentContext
+from utils import write_json_atomic
 
 import logging
 logger = logging.getLogger("dw3.observer_overlay")
 
 _SETTINGS_PATH = Path.home() / ".dw3_survey_logger" / "settings.json"
 
+# Last parsed settings.json, keyed by (mtime_ns, size) so reopening the
+# overlay doesn't re-read and re-parse an unchanged file.
+_settings_cache: Optional[Tuple[int, int, Dict[str, Any]]] = None
+
+
+def _read_settings() -> Dict[str, Any]:
+    """Return a copy of the settings.json contents ({} if the file is missing)."""
+    global _settings_cache
+    try:
+        st = _SETTINGS_PATH.stat()
+    except FileNotFoundError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    if _settings_cache is None or _settings_cache[:2] != key:
+        data = json.loads(_SETTINGS_PATH.read_text(encoding="utf-8"))
+        _settings_cache = (*key, data)
+    return dict(_settings_cache[2])
+
 
 # ============================================================================
 # CLASSES
@@ -353,31 +372,28 @@ class ObserverOverlay:
     def _save_window_size(self, width: int, height: int):
         """Persist overlay window size to settings.json (per survey type)."""
         try:
-            data = {}
-            if _SETTINGS_PATH.exists():
-                data = json.loads(_SETTINGS_PATH.read_text(encoding="utf-8"))
+            data = _read_settings()
             # Use survey-type specific keys so each survey type remembers its own size
             suffix = self.survey_type.value if self.survey_type else "regular_density"
             data[f"overlay_width_{suffix}"] = width
             data[f"overlay_height_{suffix}"] = height
             _SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-            _SETTINGS_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            write_json_atomic(_SETTINGS_PATH, data)
         except Exception as e:
             logger.debug("_save_window_size failed: %s", e)
 
     def _load_window_size(self) -> Tuple[Optional[int], Optional[int]]:
         """Load saved overlay window size from settings.json (per survey type)."""
         try:
-            if _SETTINGS_PATH.exists():
-                data = json.loads(_SETTINGS_PATH.read_text(encoding="utf-8"))
-                # Use survey-type specific keys
-                suffix = self.survey_type.value if self.survey_type else "regular_density"
-                w = data.get(f"overlay_width_{suffix}")
-                h = data.get(f"overlay_height_{suffix}")
-                # Minimum height varies by survey type
-                min_height = 350 if self.survey_type == SurveyType.BOXEL_SIZE else 425
-                if isinstance(w, int) and isinstance(h, int) and w >= 480 and h >= min_height:
-                    return w, h
+            data = _read_settings()
+            # Use survey-type specific keys
+            suffix = self.survey_type.value if self.survey_type else "regular_density"
+            w = data.get(f"overlay_width_{suffix}")
+            h = data.get(f"overlay_height_{suffix}")
+            # Minimum height varies by survey type
+            min_height = 350 if self.survey_type == SurveyType.BOXEL_SIZE else 425
+            if isinstance(w, int) and isinstance(h, int) and w >= 480 and h >= min_height:
+                return w, h
         except Exception as e:
             logger.debug("_load_window_size failed: %s", e)
         return None, None
@@ -288,8 +288,7 @@ class ObserverStorage:
             cursor = self.conn.execute(
                 "SELECT * FROM boxel_entries WHERE record_status = 'active' ORDER BY created_at_utc"
             )
-            columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return [dict(row) for row in cursor]
 
     def _upgrade_v1_to_v2(self):
         """Back up and discard v1 data (wrong survey axis: used Z instead of Y)."""
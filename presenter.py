@@ -15,6 +15,8 @@ import time
 import threading
 from typing import Dict, Any
 
+from utils import write_json_atomic
+
 logger = logging.getLogger("dw3.presenter")
 
 
@@ -327,10 +329,7 @@ class Earth2Presenter:
                     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
                     timestamped_path = export_dir / f"DW3_Earth2_Candidates_{timestamp}.csv"
 
-                    # Ensure directory exists
-                    export_dir.mkdir(parents=True, exist_ok=True)
-
-                    # Export using database method
+                    # Export using database method (creates export_dir if needed)
                     self.model.db.export_to_csv(timestamped_path)
 
                     self.model.add_comms_message(f"[INFO] CSV saved: {timestamped_path.name}")
@@ -900,13 +899,13 @@ class Earth2Presenter:
                 sp = Path(settings_path) if settings_path else (Path.home() / ".dw3_survey_logger" / "settings.json")
                 sp.parent.mkdir(parents=True, exist_ok=True)
 
-                data = {}
-                if sp.exists():
-                    try:
-                        data = json.loads(sp.read_text(encoding="utf-8"))
-                    except Exception as e:
-                        logger.warning("Failed to load settings file: %s", e)
-                        data = {}
+                try:
+                    data = json.loads(sp.read_text(encoding="utf-8"))
+                except FileNotFoundError:
+                    data = {}
+                except Exception as e:
+                    logger.warning("Failed to load settings file: %s", e)
+                    data = {}
 
                 data["journal_dir"] = str(journal_dir)
 
@@ -921,7 +920,7 @@ class Earth2Presenter:
                 if hotkey_label:
                     data.setdefault("hotkey_label", str(hotkey_label))
 
-                sp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+                write_json_atomic(sp, data)
             except Exception as e:
                 self.model.add_comms_message(f"[WARN] Could not save journal folder: {e}")
 
@@ -975,15 +974,13 @@ class Earth2Presenter:
                 sp = Path(settings_path) if settings_path else (Path.home() / ".dw3_survey_logger" / "settings.json")
                 sp.parent.mkdir(parents=True, exist_ok=True)
 
-                data = {}
-                if sp.exists():
-                    try:
-                        data = json.loads(sp.read_text(encoding="utf-8"))
-                    except Exception:
-                        data = {}
+                try:
+                    data = json.loads(sp.read_text(encoding="utf-8"))
+                except Exception:
+                    data = {}
 
                 data["hotkey_label"] = self.config["HOTKEY_LABEL"]
-                sp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+                write_json_atomic(sp, data)
 
                 self.model.add_comms_message(
                     f"[OPTIONS] Hotkey updated to: {self.config['HOTKEY_LABEL']}\n"
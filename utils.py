@@ -1,7 +1,20 @@
 from pathlib import Path
+import json
+import os
 import sys
 
 def resource_path(relative: str) -> Path:
     if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
         return Path(sys._MEIPASS) / relative  # type: ignore[attr-defined]
     return Path(__file__).resolve().parent / relative
+
+def write_json_atomic(path: Path, data) -> None:
+    """Serialize data to JSON in memory, then replace path in one step.
+
+    A crash mid-write leaves the previous file intact instead of a
+    truncated settings.json.
+    """
+    payload = json.dumps(data, indent=2).encode("utf-8")
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)